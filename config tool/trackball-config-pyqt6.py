@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
 import os
+import time
 import struct
-import binascii
+import zlib
+import logging
 import traceback
 import hid
 
@@ -16,24 +18,33 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QVBoxLayout,
     QGridLayout,
-    QSlider,
+    QSpinBox,
+    QTabWidget,
     QStyle,
     QSpacerItem,
     QSizePolicy
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QSize, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPixmapCache, QStandardItem, QStandardItemModel
 
 # -----------------------------------------------------------------------------------
 # Constants and data (same as original)
 # -----------------------------------------------------------------------------------
 
+log = logging.getLogger(__name__)
+
 VID = 0xCAFE
 PID = 0xBAFA
 CONFIG_SIZE = 22
 REPORT_ID = 3
 CONFIG_VERSION = 1
 PICTURE_FILENAME = os.path.join(os.path.dirname(__file__), "trackball.png")
+# Show full tracebacks for unexpected errors
+DEBUG = bool(os.environ.get("TRACKBALL_CONFIG_DEBUG"))
+# Errors from normal use (no device, unplugged device) that need no traceback
+EXPECTED_ERRORS = (RuntimeError, OSError)
+# How long an hid.enumerate() result is reused for repeated refreshes
+ENUMERATE_CACHE_SECONDS = 0.5
 
 BALL_FUNCTIONS = (
     ("None", "0"),
@@ -69,34 +80,184 @@ RING_FUNCTIONS = (
     ("H scroll (inverted)", "-2"),
 )
 
+# Field order of the config feature report
+CONFIG_FIELDS = (
+    "report_id",
+    "version",
+    "command",
+    "ball_x",
+    "ball_y",
+    "ball_x_shifted",
+    "ball_y_shifted",
+    "ball_cpi",
+    "ball_cpi_shifted",
+    "ring",
+    "ring_shifted",
+    "button1",
+    "button2",
+    "button3",
+    "button4",
+    "button1_shifted",
+    "button2_shifted",
+    "button3_shifted",
+    "button4_shifted",
+    "crc32",
+)
+
+# Config report layout between the report ID and the trailing CRC
+# (the CRC covers exactly these bytes), and the CRC itself
+BODY_STRUCT = struct.Struct("<Bb2b2bBBbb4b4b")
+CRC_STRUCT = struct.Struct("<L")
+# The whole config report as read back from the device
+REPORT_STRUCT = struct.Struct("<BBb2b2bBBbb4b4bL")
+
+# Config fields set with a combo, and their options. Each one also has
+# a "_shifted" twin on the "Shifted" page.
+COMBO_FIELDS = (
+    ("ball_x", BALL_FUNCTIONS),
+    ("ball_y", BALL_FUNCTIONS),
+    ("ring", RING_FUNCTIONS),
+    ("button1", BUTTON_FUNCTIONS),
+    ("button2", BUTTON_FUNCTIONS),
+    ("button3", BUTTON_FUNCTIONS),
+    ("button4", BUTTON_FUNCTIONS),
+)
+
+# Rows of each config page: label text and combo field, where None marks
+# the CPI row. The "Shifted" page uses the "_shifted" fields.
+CONFIG_ROWS = (
+    ("Ball X axis", "ball_x"),
+    ("Ball Y axis", "ball_y"),
+    ("Ball CPI", None),
+    ("Ring", "ring"),
+    ("Button 1", "button1"),
+    ("Button 2", "button2"),
+    ("Button 3", "button3"),
+    ("Button 4", "button4"),
+)
+
+# Per combo field, the report value to the combo index of that option
+CODE_TO_INDEX = {
+    name + suffix: {int(val): i for i, (_, val) in enumerate(options)}
+    for (name, options) in COMBO_FIELDS
+    for suffix in ("", "_shifted")
+}
+
+# Item models for the option tables, keyed on the table and shared by combos
+_OPTION_MODELS = {}
+
 
 # -----------------------------------------------------------------------------------
 # Helper functions to build widgets
 # -----------------------------------------------------------------------------------
 
+def option_model(options):
+    """
+    Returns an item model of (text, data) pairs, built once per options
+    table. The displayed text is options[i][0], the underlying data
+    (as returned by QComboBox.currentData()) is options[i][1].
+    """
+    model = _OPTION_MODELS.get(options)
+    if model is None:
+        model = QStandardItemModel()
+        user_role = Qt.ItemDataRole.UserRole
+        for (label, val) in options:
+            item = QStandardItem(label)
+            item.setData(val, user_role)
+            model.appendRow(item)
+        _OPTION_MODELS[options] = model
+    return model
+
+
 def make_dropdown(options):
     """
-    Creates a QComboBox, populates it with (text, data) pairs.
-    The displayed text is options[i][0], the underlying data is options[i][1].
+    Creates a QComboBox showing the (text, data) pairs in options.
+    Combos with the same options share one model.
     """
     combo = QComboBox()
-    for (label, val) in options:
-        combo.addItem(label, val)
+    combo.setModel(option_model(options))
     # Default to the first item, or the one with "0" if you prefer
     combo.setCurrentIndex(0)
     return combo
 
 
-def make_slider():
+def make_cpi_spinbox():
+    """
+    Creates a QSpinBox for the ball CPI. It holds the device value,
+    CPI / 100 in 1..120, and the "00" suffix shows it as 100..12000.
+    """
+    spinbox = QSpinBox()
+    spinbox.setRange(1, 120)
+    spinbox.setSuffix("00")
+    spinbox.setValue(1)   # default
+    return spinbox
+
+
+def fill_config_grid(grid, combos, suffix, cpi):
+    """
+    Lays out one config page from CONFIG_ROWS: a right-aligned label,
+    then the combo for that field + suffix, or the CPI spinbox.
+    """
+    align_right = Qt.AlignmentFlag.AlignRight
+    for row, (text, name) in enumerate(CONFIG_ROWS):
+        grid.addWidget(QLabel(text), row, 0, alignment=align_right)
+        grid.addWidget(cpi if name is None else combos[name + suffix], row, 1)
+
+
+def _get_trackball_pixmap(ratio):
+    """
+    Returns the sidebar image scaled to 300x300 logical pixels.
+    Scaled images live in QPixmapCache, shared by all windows,
+    so the rescale only happens once per device pixel ratio.
+    """
+    size = int(300 * ratio)
+    key = f"trackball:{size}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        try:
+            pixmap = QPixmap(PICTURE_FILENAME)
+        except Exception:
+            pixmap = QPixmap()  # fallback if not found
+        pixmap = pixmap.scaled(
+            QSize(size, size), Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+# -----------------------------------------------------------------------------------
+# HID I/O off the GUI thread
+# -----------------------------------------------------------------------------------
+
+class HidIOSignals(QObject):
+    finished = pyqtSignal(object)   # the transfer's return value
+    error = pyqtSignal(object)      # the exception it raised
+    done = pyqtSignal()             # emitted last, either way
+
+
+class HidIOWorker(QRunnable):
     """
-    Creates a QSlider from 1..120 with step=1.
-    We'll pair it with a label that updates the
-    displayed value × 100 (as in GTK's "format-value").
+    Runs one HID transfer, fn(*args), on a QThreadPool thread.
+    The result is reported through signals, which Qt delivers
+    on the GUI thread.
     """
-    slider = QSlider(Qt.Orientation.Horizontal)
-    slider.setRange(1, 120)
-    slider.setValue(1)   # default
-    return slider
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = HidIOSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
 
 
 # -----------------------------------------------------------------------------------
@@ -110,6 +271,10 @@ class TrackballConfigWindow(QWidget):
 
         # Data models replaced by direct combo usage in PyQt
         self.devices_dropdown = QComboBox()
+        self.enumerated_devices = []
+        self.enumerated_at = None
+        # Open handle to the selected trackball, kept across loads and saves
+        self.hid_device = None
         
         # Buttons
         self.refresh_button = QPushButton()
@@ -127,33 +292,16 @@ class TrackballConfigWindow(QWidget):
         self.save_button.clicked.connect(self.save_button_clicked)
 
 
-        # Make combos and sliders
-        self.ball_x_dropdown = make_dropdown(BALL_FUNCTIONS)
-        self.ball_x_shifted_dropdown = make_dropdown(BALL_FUNCTIONS)
-        self.ball_y_dropdown = make_dropdown(BALL_FUNCTIONS)
-        self.ball_y_shifted_dropdown = make_dropdown(BALL_FUNCTIONS)
-        self.ring_dropdown = make_dropdown(RING_FUNCTIONS)
-        self.ring_shifted_dropdown = make_dropdown(RING_FUNCTIONS)
-
-        self.button1_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button1_shifted_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button2_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button2_shifted_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button3_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button3_shifted_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button4_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-        self.button4_shifted_dropdown = make_dropdown(BUTTON_FUNCTIONS)
-
-        self.ball_cpi = make_slider()
-        self.ball_cpi_shifted = make_slider()
+        # Make combos and spinboxes for the "Normal" page. The "Shifted"
+        # page is only built once it's needed, see ensure_shifted_built().
+        # Combos are keyed by the config field they set.
+        self.combos = {
+            name: make_dropdown(options) for (name, options) in COMBO_FIELDS
+        }
 
-        # We'll keep a label to show the slider's “value * 100” text
-        # for each slider. We’ll update these when the slider moves.
-        self.ball_cpi_label = QLabel("100")  # default for value=1
-        self.ball_cpi_shifted_label = QLabel("100")
+        self.ball_cpi = make_cpi_spinbox()
 
-        self.ball_cpi.valueChanged.connect(self.on_cpi_changed)
-        self.ball_cpi_shifted.valueChanged.connect(self.on_cpi_shifted_changed)
+        self.shifted_built = False
 
         # Build layouts
         # Main horizontal layout
@@ -174,89 +322,30 @@ class TrackballConfigWindow(QWidget):
         actions_hbox.addWidget(self.save_button)
         left_vbox.addLayout(actions_hbox)
 
-        # Grid for config
-        grid = QGridLayout()
-        row = 0
-        # Row 0: "Normal" / "Shifted"
-        grid.addWidget(QLabel(""), row, 0)
-        normal_label = QLabel("Normal")
-        normal_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        grid.addWidget(normal_label, row, 1)
-        shifted_label = QLabel("Shifted")
-        shifted_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        grid.addWidget(shifted_label, row, 2)
-        row += 1
-
-        # Row: Ball X
-        grid.addWidget(QLabel("Ball X axis"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.ball_x_dropdown, row, 1)
-        grid.addWidget(self.ball_x_shifted_dropdown, row, 2)
-        row += 1
-
-        # Row: Ball Y
-        grid.addWidget(QLabel("Ball Y axis"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.ball_y_dropdown, row, 1)
-        grid.addWidget(self.ball_y_shifted_dropdown, row, 2)
-        row += 1
-
-        # Row: Ball CPI
-        grid.addWidget(QLabel("Ball CPI"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        # For each slider, we’ll place the slider plus a small label side by side
-        cpi_hbox = QHBoxLayout()
-        cpi_hbox.addWidget(self.ball_cpi)
-        cpi_hbox.addWidget(self.ball_cpi_label)
-        grid.addLayout(cpi_hbox, row, 1)
-
-        cpi_shifted_hbox = QHBoxLayout()
-        cpi_shifted_hbox.addWidget(self.ball_cpi_shifted)
-        cpi_shifted_hbox.addWidget(self.ball_cpi_shifted_label)
-        grid.addLayout(cpi_shifted_hbox, row, 2)
-        row += 1
-
-        # Row: Ring
-        grid.addWidget(QLabel("Ring"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.ring_dropdown, row, 1)
-        grid.addWidget(self.ring_shifted_dropdown, row, 2)
-        row += 1
-
-        # Rows: Buttons
-        grid.addWidget(QLabel("Button 1"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.button1_dropdown, row, 1)
-        grid.addWidget(self.button1_shifted_dropdown, row, 2)
-        row += 1
-
-        grid.addWidget(QLabel("Button 2"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.button2_dropdown, row, 1)
-        grid.addWidget(self.button2_shifted_dropdown, row, 2)
-        row += 1
-
-        grid.addWidget(QLabel("Button 3"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.button3_dropdown, row, 1)
-        grid.addWidget(self.button3_shifted_dropdown, row, 2)
-        row += 1
-
-        grid.addWidget(QLabel("Button 4"), row, 0, alignment=Qt.AlignmentFlag.AlignRight)
-        grid.addWidget(self.button4_dropdown, row, 1)
-        grid.addWidget(self.button4_shifted_dropdown, row, 2)
-        row += 1
-
-        left_vbox.addLayout(grid)
+        # Tabs for the normal and shifted config
+        self.config_tabs = QTabWidget()
+
+        normal_page = QWidget()
+        fill_config_grid(QGridLayout(normal_page), self.combos, "", self.ball_cpi)
+        self.config_tabs.addTab(normal_page, "Normal")
+
+        self.shifted_page = QWidget()
+        self.config_tabs.addTab(self.shifted_page, "Shifted")
+        self.config_tabs.currentChanged.connect(self.on_tab_changed)
+
+        left_vbox.addWidget(self.config_tabs)
         main_hbox.addLayout(left_vbox)
 
         # The image on the right
-        try:
-            pixmap = QPixmap(PICTURE_FILENAME)
-        except Exception:
-            pixmap = QPixmap()  # fallback if not found
         image_label = QLabel()
-        image_label.setPixmap(pixmap.scaled(
-            QSize(300, 300), Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        ))
+        image_label.setPixmap(_get_trackball_pixmap(self.devicePixelRatioF()))
         main_hbox.addWidget(image_label)
 
-        # Populate the device list
-        self.refresh_device_list()
+        # Populate the device list once the event loop is running, so
+        # the first paint doesn't wait on USB enumeration
+        self.load_button.setEnabled(False)
+        self.save_button.setEnabled(False)
+        QTimer.singleShot(0, self.refresh_device_list)
 
         self.setLayout(main_hbox)
 
@@ -266,7 +355,7 @@ class TrackballConfigWindow(QWidget):
 
     def show_exception_dialog(self, exc_str):
         """
-        Show a modal error dialog with the given traceback string.
+        Show a modal error dialog with the given error text.
         """
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Icon.Critical)
@@ -275,27 +364,95 @@ class TrackballConfigWindow(QWidget):
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
 
-    def on_cpi_changed(self):
-        value = self.ball_cpi.value()
-        self.ball_cpi_label.setText(str(value * 100))
+    def show_error(self, exc):
+        """
+        Show exc in the error dialog. The traceback is only formatted
+        for unexpected errors in DEBUG mode.
+        """
+        if DEBUG and not isinstance(exc, EXPECTED_ERRORS):
+            self.show_exception_dialog("".join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__)
+            ))
+        else:
+            self.show_exception_dialog(f"{type(exc).__name__}: {exc}")
 
-    def on_cpi_shifted_changed(self):
-        value = self.ball_cpi_shifted.value()
-        self.ball_cpi_shifted_label.setText(str(value * 100))
+    def on_tab_changed(self, index):
+        if self.config_tabs.widget(index) is self.shifted_page:
+            self.ensure_shifted_built()
+
+    def ensure_shifted_built(self):
+        """
+        Creates the widgets on the "Shifted" page the first time they're
+        needed: when the tab is opened, or a config is loaded or saved.
+        """
+        if self.shifted_built:
+            return
+        self.shifted_built = True
+
+        self.combos.update({
+            name + "_shifted": make_dropdown(options) for (name, options) in COMBO_FIELDS
+        })
+
+        self.ball_cpi_shifted = make_cpi_spinbox()
+
+        fill_config_grid(
+            QGridLayout(self.shifted_page), self.combos, "_shifted", self.ball_cpi_shifted
+        )
 
     # ---------------------------------------------------------------------------------
     # Device handling
     # ---------------------------------------------------------------------------------
 
+    def enumerate_devices(self):
+        """
+        Returns the attached trackballs, letting hidapi filter by VID/PID.
+        Results are reused for ENUMERATE_CACHE_SECONDS so repeated
+        refresh clicks don't walk the HID tree each time.
+        """
+        now = time.monotonic()
+        if self.enumerated_at is None or now - self.enumerated_at > ENUMERATE_CACHE_SECONDS:
+            self.enumerated_devices = hid.enumerate(VID, PID)
+            self.enumerated_at = now
+        return self.enumerated_devices
+
+    def open_device(self):
+        """
+        Returns the open handle to the trackball, opening it if needed.
+        """
+        if self.hid_device is None:
+            dev = hid.device()
+            dev.open(VID, PID)
+            self.hid_device = dev
+        return self.hid_device
+
+    def close_device(self):
+        if self.hid_device is not None:
+            self.hid_device.close()
+            self.hid_device = None
+
+    def device_transfer(self, transfer):
+        """
+        Runs transfer(dev) on the open handle. A handle gone stale (e.g.
+        the trackball was replugged) fails with OSError, so the device is
+        reopened and the transfer retried once.
+        """
+        try:
+            return transfer(self.open_device())
+        except OSError:
+            self.close_device()
+            return transfer(self.open_device())
+
+    def closeEvent(self, event):
+        # Let a transfer in flight finish before closing its handle
+        QThreadPool.globalInstance().waitForDone()
+        self.close_device()
+        super().closeEvent(event)
+
     def refresh_device_list(self):
         self.devices_dropdown.clear()
+        self.close_device()
 
-        devices = [
-            d
-            for d in hid.enumerate()
-            if d["vendor_id"] == VID and d["product_id"] == PID
-        ]
-        #self.test = devices[0]
+        devices = self.enumerate_devices()
         if devices:
             for d in devices:
                 # We store the path as itemData
@@ -305,232 +462,149 @@ class TrackballConfigWindow(QWidget):
 
             self.load_button.setEnabled(True)
             self.save_button.setEnabled(True)
+
+            try:
+                self.open_device()
+            except OSError:
+                pass  # retried on the next load or save
         else:
             self.devices_dropdown.addItem("No devices found", "NULL")
             self.load_button.setEnabled(False)
             self.save_button.setEnabled(False)
 
+    def start_hid_io(self, on_finished, fn, *args):
+        """
+        Runs fn(*args) on the thread pool and passes its result to
+        on_finished back on the GUI thread. The device buttons stay
+        disabled meanwhile, so only one transfer uses the handle at a time.
+        """
+        worker = HidIOWorker(fn, *args)
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+        worker.signals.error.connect(self.on_hid_io_error)
+        worker.signals.done.connect(self.on_hid_io_done)
+        self.set_device_buttons_enabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def set_device_buttons_enabled(self, enabled):
+        self.refresh_button.setEnabled(enabled)
+        self.load_button.setEnabled(enabled)
+        self.save_button.setEnabled(enabled)
+
+    def on_hid_io_error(self, exc):
+        if isinstance(exc, OSError):
+            # Drop the handle so the next attempt reopens the device
+            self.close_device()
+        self.show_error(exc)
+
+    def on_hid_io_done(self):
+        self.set_device_buttons_enabled(True)
+
+    def check_device_selected(self):
+        path = self.devices_dropdown.currentData()
+        if path == "NULL":
+            raise RuntimeError("No device selected.")
+        return path
+
     def load_button_clicked(self):
         try:
-            self.load_config_from_device()
+            path = self.check_device_selected()
         except Exception as e:
-            self.show_exception_dialog(traceback.format_exc())
+            self.show_error(e)
+            return
+        log.debug("Loading config from %s", path)
+        self.start_hid_io(self.apply_config, self.load_config_from_device)
 
     def save_button_clicked(self):
         try:
-            self.save_config_to_device()
+            self.check_device_selected()
+            data = self.build_config_report()
         except Exception as e:
-            self.show_exception_dialog(traceback.format_exc())
+            self.show_error(e)
+            return
+        self.start_hid_io(None, self.save_config_to_device, data)
 
     def load_config_from_device(self):
-        path = self.devices_dropdown.currentData()
-        print(path)
-        if path == "NULL":
-            raise RuntimeError("No device selected.")
+        """
+        Reads and decodes the config report, returning the field values
+        and the combo index for each combo field. Runs on a HidIOWorker
+        thread, so it must not touch any widgets; anything it raises
+        is shown through on_hid_io_error.
+        """
+        data = self.device_transfer(
+            lambda dev: dev.get_feature_report(REPORT_ID, CONFIG_SIZE + 1)
+        )
+        if len(data) != REPORT_STRUCT.size:
+            raise RuntimeError(f"Unexpected config report length {len(data)}.")
+        # hidapi returns a list of unsigned ints; the struct decodes the
+        # signed fields so inverted functions come back as e.g. -1
+        val = dict(zip(CONFIG_FIELDS, REPORT_STRUCT.unpack(bytes(data))))
+
+        indices = {}
+        for name, code_to_index in CODE_TO_INDEX.items():
+            try:
+                indices[name] = code_to_index[val[name]]
+            except KeyError:
+                raise RuntimeError(
+                    f"Unknown value {val[name]} for {name} in the device config."
+                ) from None
+        return val, indices
+
+    def apply_config(self, result):
+        """
+        Shows a config decoded by load_config_from_device in the widgets.
+        """
+        val, indices = result
+        self.ensure_shifted_built()
+        # Set combos and spinboxes with signals and repaints held back
+        # until every widget has its new value
+        widgets = (*self.combos.values(), self.ball_cpi, self.ball_cpi_shifted)
+        self.setUpdatesEnabled(False)
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            for name, combo in self.combos.items():
+                combo.setCurrentIndex(indices[name])
+            self.ball_cpi.setValue(val["ball_cpi"])
+            self.ball_cpi_shifted.setValue(val["ball_cpi_shifted"])
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+            self.setUpdatesEnabled(True)
+        log.debug("Loaded config %s", val)
+
+    def build_config_report(self):
+        """
+        Packs the widgets' settings into a config report, CRC included.
+        """
+        self.ensure_shifted_built()
 
-        #dev = hid.device(path=path.encode("ascii"))
-        dev = hid.device()
-        dev.open(VID,PID)
-        #dev = hid.device(path=self.test["path"])
-        #print(dev,self.test,sep="\n")
-        data = dev.get_feature_report(REPORT_ID, CONFIG_SIZE + 1)
-        dev.close()
-        data_list = [
-            "report_id",
-            "version",
-            "command",
-            "ball_x",
-            "ball_y",
-            "ball_x_shifted",
-            "ball_y_shifted",
-            "ball_cpi",
-            "ball_cpi_shifted",
-            "ring",
-            "ring_shifted",
-            "button1",
-            "button2",
-            "button3",
-            "button4",
-            "button1_shifted",
-            "button2_shifted",
-            "button3_shifted",
-            "button4_shifted",
-            "crc32",
-        ]
-        #print(data)
-        val = dict(zip(data_list,data))
-        # for item in unpacked:
-        #     print(item)
-        # unpacked = struct.unpack("<BBb2b2bBBbb4b4bL", data)
-        # (
-        #     report_id,
-        #     version,
-        #     command,
-        #     ball_x,
-        #     ball_y,
-        #     ball_x_shifted,
-        #     ball_y_shifted,
-        #     ball_cpi,
-        #     ball_cpi_shifted,
-        #     ring,
-        #     ring_shifted,
-        #     button1,
-        #     button2,
-        #     button3,
-        #     button4,
-        #     button1_shifted,
-        #     button2_shifted,
-        #     button3_shifted,
-        #     button4_shifted,
-        #     crc32,
-        # ) = unpacked
-        # BALL_FUNCTIONS = (
-        #     ("None", "0"),
-        #     ("Cursor X", "1"),
-        #     ("Cursor Y", "2"),
-        #     ("V scroll", "3"),
-        #     ("H scroll", "4"),
-        #     ("Cursor X (inverted)", "-1"),
-        #     ("Cursor Y (inverted)", "-2"),
-        #     ("V scroll (inverted)", "-3"),
-        #     ("H scroll (inverted)", "-4"),
-        # )
-        load_ball = {
-            "0":"None",
-            "1":"Cursor X",
-            "2":"Cursor Y",
-            "3":"V scroll",
-            "4":"H scroll",
-            "255":"Cursor X (inverted)",
-            "254":"Cursor Y (inverted)",
-            "253":"V scroll (inverted)",
-            "252":"H scroll (inverted)",
-        }
-        load_button = {
-            "0":"None",
-            "1":"Button 1 (left)",
-            "2":"Button 2 (right)",
-            "3":"Button 3 (middle)",
-            "4":"Button 4 (back)",
-            "5":"Button 5 (forward)",
-            "6":"Button 6",
-            "7":"Button 7",
-            "8":"Button 8",
-            "9":"Click-drag",
-            "10":"Shift",
-        }
+        val = {name: int(combo.currentData()) for name, combo in self.combos.items()}
+        val["version"] = CONFIG_VERSION
+        val["command"] = 0
+        val["ball_cpi"] = self.ball_cpi.value()
+        val["ball_cpi_shifted"] = self.ball_cpi_shifted.value()
 
-        load_ring = {
-            "0":"None",
-            "1":"V scroll",
-            "2":"H scroll",
-            "255":"V scroll (inverted)",
-            "254":"H scroll (inverted)",
-        }
-        # Set combos
-        # self.set_combo_by_data(self.ball_x_dropdown, val["ball_x"])
-        # self.set_combo_by_data(self.ball_x_shifted_dropdown, val["ball_x_shifted"])
-        # self.set_combo_by_data(self.ball_y_dropdown, val["ball_y"])
-        # self.set_combo_by_data(self.ball_y_shifted_dropdown, val["ball_y_shifted"])
-        # self.set_combo_by_data(self.ring_dropdown, val["ring"])
-        # self.set_combo_by_data(self.ring_shifted_dropdown, val["ring_shifted"])
-        # self.set_combo_by_data(self.button1_dropdown, val["button1"])
-        # self.set_combo_by_data(self.button1_shifted_dropdown, val["button1_shifted"])
-        # self.set_combo_by_data(self.button2_dropdown, val["button2"])
-        # self.set_combo_by_data(self.button2_shifted_dropdown, val["button2_shifted"])
-        # self.set_combo_by_data(self.button3_dropdown, val["button3"])
-        # self.set_combo_by_data(self.button3_shifted_dropdown, val["button3_shifted"])
-        # self.set_combo_by_data(self.button4_dropdown, val["button4"])
-        # self.set_combo_by_data(self.button4_shifted_dropdown, val["button4_shifted"])
-        self.ball_x_dropdown.setCurrentText(load_ball[str(val["ball_x"])])
-        self.ball_x_shifted_dropdown.setCurrentText(load_ball[str(val["ball_x_shifted"])])
-        self.ball_y_dropdown.setCurrentText(load_ball[str(val["ball_x"])])
-        self.ball_y_shifted_dropdown.setCurrentText(load_ball[str(val["ball_y_shifted"])])
-        self.ring_dropdown.setCurrentText(load_ring[str(val["ring"])])
-        self.ring_shifted_dropdown.setCurrentText(load_ring[str(val["ring_shifted"])])
-        self.button1_dropdown.setCurrentText(load_button[str(val["button1"])])
-        self.button1_shifted_dropdown.setCurrentText(load_button[str(val["button1_shifted"])])
-        self.button2_dropdown.setCurrentText(load_button[str(val["button2"])])
-        self.button2_shifted_dropdown.setCurrentText(load_button[str(val["button2_shifted"])])
-        self.button3_dropdown.setCurrentText(load_button[str(val["button3"])])
-        self.button3_shifted_dropdown.setCurrentText(load_button[str(val["button3_shifted"])])
-        self.button4_dropdown.setCurrentText(load_button[str(val["button4"])])
-        self.button4_shifted_dropdown.setCurrentText(load_button[str(val["button4_shifted"])])
-
-
-
-        self.ball_cpi.setValue(val["ball_cpi"])
-        self.ball_cpi_shifted.setValue(val["ball_cpi_shifted"])
-        print(val)
-
-    def save_config_to_device(self):
-        path = self.devices_dropdown.currentData()
-        if path == "NULL":
-            raise RuntimeError("No device selected.")
-        dev = hid.device()
-        dev.open(VID,PID)
-
-        command = 0
-        ball_x = int(self.ball_x_dropdown.currentData())
-        ball_x_shifted = int(self.ball_x_shifted_dropdown.currentData())
-        ball_y = int(self.ball_y_dropdown.currentData())
-        ball_y_shifted = int(self.ball_y_shifted_dropdown.currentData())
-        ring = int(self.ring_dropdown.currentData())
-        ring_shifted = int(self.ring_shifted_dropdown.currentData())
-        button1 = int(self.button1_dropdown.currentData())
-        button1_shifted = int(self.button1_shifted_dropdown.currentData())
-        button2 = int(self.button2_dropdown.currentData())
-        button2_shifted = int(self.button2_shifted_dropdown.currentData())
-        button3 = int(self.button3_dropdown.currentData())
-        button3_shifted = int(self.button3_shifted_dropdown.currentData())
-        button4 = int(self.button4_dropdown.currentData())
-        button4_shifted = int(self.button4_shifted_dropdown.currentData())
-        ball_cpi_val = int(self.ball_cpi.value())
-        ball_cpi_shifted_val = int(self.ball_cpi_shifted.value())
-
-        # Pack
-        data = struct.pack(
-            "<BBb2b2bBBbb4b4b",
-            REPORT_ID,
-            CONFIG_VERSION,
-            command,
-            ball_x,
-            ball_y,
-            ball_x_shifted,
-            ball_y_shifted,
-            ball_cpi_val,
-            ball_cpi_shifted_val,
-            ring,
-            ring_shifted,
-            button1,
-            button2,
-            button3,
-            button4,
-            button1_shifted,
-            button2_shifted,
-            button3_shifted,
-            button4_shifted,
-        )
-        crc32_val = binascii.crc32(data[1:])
-        crc_bytes = struct.pack("<L", crc32_val)
-        data += crc_bytes
+        # Pack everything between the report ID and the CRC, in report order
+        body = BODY_STRUCT.pack(*(val[name] for name in CONFIG_FIELDS[1:-1]))
+        return bytes((REPORT_ID,)) + body + CRC_STRUCT.pack(zlib.crc32(body))
+
+    def save_config_to_device(self, data):
+        """
+        Sends a report from build_config_report. Runs on a HidIOWorker thread.
+        """
+        def send(dev):
+            # hidapi reports a failed write as -1 instead of raising
+            if dev.send_feature_report(data) != len(data):
+                raise OSError("Failed to send the config to the device.")
 
-        #dev = hid.device(path=path.encode("ascii"))
-        #dev = hid.device(path=self.test['path'])
-        dev.send_feature_report(data)
-        dev.close()
+        self.device_transfer(send)
 
     def set_combo_by_data(self, combo, data_value):
         """Helper to select a QComboBox item by its underlying data."""
-        #print(data_value)
-        for i in range(combo.count()):
-            if combo.currentText() == data_value:
-                combo.setCurrentIndex()
-            # if combo.itemData(i) == data_value:
-            #     combo.setCurrentIndex(i)
-            #     return
+        index = combo.findData(data_value)
         # if not found, fallback
-        combo.setCurrentIndex(0)
+        combo.setCurrentIndex(max(index, 0))
 
 
 # -----------------------------------------------------------------------------------